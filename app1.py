@@ -4,7 +4,6 @@ from datetime import datetime, timedelta
 from typing import Dict, Tuple
 
 import streamlit as st
-import requests
 from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI
 
@@ -20,63 +19,95 @@ from src.constants import DEFAULT_DRILL_INFO, CATEGORY_SUBCATEGORY_MAP
 from src.utils import (
     validate_date,
     auto_correct_input,
-    generate_drill_description,
     infer_subcategory,
     infer_purpose,
     infer_yes_no,
     check_for_cancellation,
 )
 from src.questions import HACKATHON_QUESTIONS
+from src.transcript import TranscriptRecorder
+from src.speculative import SpeculativeExecutor
 
 
 class StreamlitHackathonChatbot:
-    def __init__(self):
-        self.google_api_key = os.getenv("GOOGLE_API_KEY")
-        if not self.google_api_key:
-            st.error("Google API Key not found. Please set it in your .env file.")
-            st.stop()
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-1.5-flash", temperature=0.7, api_key=self.google_api_key
-        )
+    def __init__(self, llm=None, session_state=None):
+        # llm and session_state can be injected to drive the chatbot outside of Streamlit (see src/replay.py)
+        self.session_state = st.session_state if session_state is None else session_state
+        if llm is None:
+            self.google_api_key = os.getenv("GOOGLE_API_KEY")
+            if not self.google_api_key:
+                st.error("Google API Key not found. Please set it in your .env file.")
+                st.stop()
+            llm = ChatGoogleGenerativeAI(
+                model="gemini-1.5-flash", temperature=0.7, api_key=self.google_api_key
+            )
+        self.llm = llm
+        self._base_llm = llm
         self.CATEGORY_SUBCATEGORY_MAP = CATEGORY_SUBCATEGORY_MAP
 
     def initialize_session_state(self):
         """Initialize session state variables."""
-        if "started" not in st.session_state:
-            st.session_state.started = False
-        if "current_question_index" not in st.session_state:
-            st.session_state.current_question_index = 0
-        if "hackathon_details" not in st.session_state:
-            st.session_state.hackathon_details = DEFAULT_DRILL_INFO.copy()
-        if "chat_history" not in st.session_state:
-            st.session_state.chat_history = []
-        if "registration_complete" not in st.session_state:
-            st.session_state.registration_complete = False
+        if "started" not in self.session_state:
+            self.session_state.started = False
+        if "current_question_index" not in self.session_state:
+            self.session_state.current_question_index = 0
+        if "hackathon_details" not in self.session_state:
+            self.session_state.hackathon_details = DEFAULT_DRILL_INFO.copy()
+        if "chat_history" not in self.session_state:
+            self.session_state.chat_history = []
+        if "registration_complete" not in self.session_state:
+            self.session_state.registration_complete = False
+        if "transcript_recorder" not in self.session_state:
+            self.session_state.transcript_recorder = None
+        if "speculative" not in self.session_state:
+            # Background calls are recorded separately so they don't leak into transcript turns
+            self.session_state.speculative = SpeculativeExecutor(self._base_llm, API_ENDPOINT)
+        if self.session_state.transcript_recorder:
+            self.llm = self.session_state.transcript_recorder.wrap_llm(self.llm)
 
     def add_to_chat_history(self, role: str, content: str):
         """Add a message to chat history."""
-        st.session_state.chat_history.append({"role": role, "content": content})
+        self.session_state.chat_history.append({"role": role, "content": content})
+        recorder = self.session_state.get("transcript_recorder")
+        if recorder:
+            recorder.record_message(role, content)
 
     def display_chat_history(self):
         """Display all messages in chat history."""
-        for message in st.session_state.chat_history:
+        for message in self.session_state.chat_history:
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
 
     def handle_user_input(self, user_input: str, current_question: tuple) -> bool:
         """Process user input for the current question"""
         question, key = current_question
-
+        recorder = self.session_state.get("transcript_recorder")
+        if recorder:
+            recorder.start_turn(question, key, user_input)
+        accepted = self._process_user_input(user_input, key)
+        if recorder:
+            recorder.end_turn(accepted)
+        speculative = self.session_state.get("speculative")
+        if speculative and accepted:
+            # Start generating the description in the background once its inputs are known
+            speculative.update(self.session_state.hackathon_details)
+        return accepted
+
+    def _process_user_input(self, user_input: str, key: str) -> bool:
+        """Validate and store the answer for a question. Returns True if the answer was accepted."""
         # Add user response to chat history
         self.add_to_chat_history("user", user_input)
 
         # Check for cancellation
         if check_for_cancellation(user_input, self.llm):
             self.add_to_chat_history("assistant", "Registration process has been canceled.")
-            st.session_state.registration_complete = True
+            self.session_state.registration_complete = True
+            speculative = self.session_state.get("speculative")
+            if speculative:
+                speculative.invalidate()
             return False
 
-        drill_info = st.session_state.hackathon_details
+        drill_info = self.session_state.hackathon_details
 
         # Process response based on question type
         if key == "drillSubCategory":
@@ -110,14 +141,14 @@ class StreamlitHackathonChatbot:
             drill_info[key] = corrected_input.title() if corrected_input.lower() in ["theme based", "product based"] else "Theme Based"
 
         elif key == "drillPurpose":
-            inferred_purpose = infer_purpose(st.session_state, user_input, self.llm)
+            inferred_purpose = infer_purpose(self.session_state, user_input, self.llm)
             drill_info[key] = inferred_purpose
 
         else:
             drill_info[key] = user_input
 
         # Explicitly update session state
-        st.session_state.hackathon_details = drill_info
+        self.session_state.hackathon_details = drill_info
         return True
 
     def prepare_dates(self, registration_start_date: str) -> Dict[str, str]:
@@ -136,12 +167,26 @@ class StreamlitHackathonChatbot:
 
     def submit_hackathon(self) -> bool:
         """Submit hackathon details to the API."""
-        drill_info = st.session_state.hackathon_details
+        recorder = self.session_state.get("transcript_recorder")
+        if recorder:
+            recorder.start_submit()
+        submitted = False
+        try:
+            submitted = self._submit_hackathon()
+        finally:
+            # Record failed final steps too; they are usually the slow ones
+            if recorder:
+                recorder.end_submit(submitted)
+        return submitted
+
+    def _submit_hackathon(self) -> bool:
+        """Generate the description and send the payload to the API."""
+        drill_info = self.session_state.hackathon_details
         dates = self.prepare_dates(drill_info["drillRegistrationStartDt"])
 
         # Generate description
         cost_info = "Free" if not drill_info["isDrillPaid"] else "Paid"
-        drill_info["drillDescription"] = generate_drill_description(drill_info, self.llm) + f" This event is {cost_info}."
+        drill_info["drillDescription"] = self.session_state.speculative.get_description(drill_info) + f" This event is {cost_info}."
 
         # Prepare payload
         payload = {
@@ -181,7 +226,7 @@ class StreamlitHackathonChatbot:
         }
 
         try:
-            response = requests.post(API_ENDPOINT, json=payload)
+            response = self.session_state.speculative.post(payload)
             response.raise_for_status()
             api_response = response.json()
             cust_url = api_response.get("drillCustUrl")
@@ -196,11 +241,13 @@ class StreamlitHackathonChatbot:
 
     def reset_chat(self):
         """Reset the chat to initial state."""
-        st.session_state.started = False
-        st.session_state.current_question_index = 0
-        st.session_state.hackathon_details = DEFAULT_DRILL_INFO.copy()
-        st.session_state.chat_history = []
-        st.session_state.registration_complete = False
+        self.session_state.started = False
+        self.session_state.current_question_index = 0
+        self.session_state.hackathon_details = DEFAULT_DRILL_INFO.copy()
+        self.session_state.chat_history = []
+        self.session_state.registration_complete = False
+        self.session_state.transcript_recorder = None
+        self.session_state.speculative.invalidate()
 
     def run(self):
         """Main run loop for the Streamlit chatbot"""
@@ -211,38 +258,44 @@ class StreamlitHackathonChatbot:
         self.display_chat_history()
 
         # Start button for new registration
-        if not st.session_state.started:
+        if not self.session_state.started:
             if st.button("Start Registration"):
-                st.session_state.started = True
+                self.session_state.started = True
+                # Record the session when TRANSCRIPT_DIR is set
+                recorder = TranscriptRecorder.from_env(source="streamlit")
+                self.session_state.transcript_recorder = recorder
+                self.session_state.speculative.llm = recorder.wrap_background_llm(self._base_llm) if recorder else self._base_llm
+                # Warm the Gemini and drills-API connections while the user answers
+                self.session_state.speculative.prewarm()
                 self.add_to_chat_history("assistant", "Welcome! Let's register your hackathon event.")
                 self.add_to_chat_history("assistant", HACKATHON_QUESTIONS[0][0])
                 st.rerun()
             return
 
         # Handle registration process
-        if st.session_state.started and not st.session_state.registration_complete:
-            current_question = HACKATHON_QUESTIONS[st.session_state.current_question_index]
+        if self.session_state.started and not self.session_state.registration_complete:
+            current_question = HACKATHON_QUESTIONS[self.session_state.current_question_index]
             user_input = st.chat_input(f"Your response for: {current_question[0]}")
 
             if user_input:
                 result = self.handle_user_input(user_input, current_question)
                 
                 if result:
-                    st.session_state.current_question_index += 1
+                    self.session_state.current_question_index += 1
                     
-                    if st.session_state.current_question_index < len(HACKATHON_QUESTIONS):
-                        next_question = HACKATHON_QUESTIONS[st.session_state.current_question_index][0]
+                    if self.session_state.current_question_index < len(HACKATHON_QUESTIONS):
+                        next_question = HACKATHON_QUESTIONS[self.session_state.current_question_index][0]
                         self.add_to_chat_history("assistant", next_question)
                         st.rerun()  # Force immediate UI update
                     else:
                         if self.submit_hackathon():
-                            st.session_state.registration_complete = True
+                            self.session_state.registration_complete = True
                             self.add_to_chat_history("assistant", "Registration complete! Thank you!")
                             st.rerun()  # Force final state update
                         return
 
         # Show reset button after completion
-        if st.session_state.registration_complete:
+        if self.session_state.registration_complete:
             if st.button("Start New Registration"):
                 self.reset_chat()
                 st.rerun()
@@ -8,24 +8,34 @@ from src.constants import DEFAULT_DRILL_INFO, CATEGORY_SUBCATEGORY_MAP
 from src.utils import (
     validate_date,
     auto_correct_input,
-    generate_drill_description,
     infer_subcategory,
     infer_purpose,
     infer_yes_no,
     check_for_cancellation
 )
 from src.questions import HACKATHON_QUESTIONS
+from src.transcript import TranscriptRecorder
+from src.speculative import SpeculativeExecutor
 import requests
 
 load_dotenv()
 
+API_ENDPOINT = "https://api-dev.whereuelevate.com/internity/api/v1/drills"  # Replace with the actual API URL
+
 class HackathonChatbot:
-    def __init__(self, google_api_key: str):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-1.5-flash", 
-            temperature=0.7, 
-            api_key=google_api_key
-        )
+    def __init__(self, google_api_key: str, llm=None):
+        # llm can be injected to drive the chatbot without Gemini (see src/replay.py)
+        if llm is None:
+            llm = ChatGoogleGenerativeAI(
+                model="gemini-1.5-flash", 
+                temperature=0.7, 
+                api_key=google_api_key
+            )
+        self.llm = llm
+        self._base_llm = self.llm
+        self.recorder = None
+        # Background calls are recorded separately so they don't leak into transcript turns
+        self.speculative = SpeculativeExecutor(self._base_llm, API_ENDPOINT)
         self.CATEGORY_SUBCATEGORY_MAP = CATEGORY_SUBCATEGORY_MAP
         self.JSON_FILE_PATH = os.path.join(os.getcwd(), 'data', 'hackathon_details.json')
         self.graph = self._build_graph()
@@ -35,56 +45,65 @@ class HackathonChatbot:
         for question, key in HACKATHON_QUESTIONS:
             while True:
                 user_response = input(f"AI Chatbot: {question}\nYou: ").strip()
-                
-                # Check if the user wants to cancel
-                if check_for_cancellation(user_response, self.llm):
-                    print("AI Chatbot: Registration process has been canceled.")
-                    state["current_step"] = "cancel"
+                if self.recorder:
+                    self.recorder.start_turn(question, key, user_response)
+                accepted = self._handle_answer(state, key, user_response)
+                if self.recorder:
+                    self.recorder.end_turn(accepted)
+                if state["current_step"] == "cancel":
                     return state
-                
-                # Handle specific fields
-                if key == "drillSubCategory":
-                    inferred_subcategory = infer_subcategory(
-                        user_response=user_response,
-                        llm=self.llm,
-                        category_subcategory_map=self.CATEGORY_SUBCATEGORY_MAP
-                    )
-                    if inferred_subcategory:
-                        state["hackathon_details"]["drillSubCategory"] = inferred_subcategory
-                        state["hackathon_details"]["drillCategory"] = self.CATEGORY_SUBCATEGORY_MAP[inferred_subcategory]
-                        break
-                    else:
-                        print("Could not determine a valid subcategory. Please try again.")
-                elif key == "drillRegistrationStartDt":
-                    if not validate_date(user_response):
-                        print("Invalid date format. Please use DD-MM-YYYY.")
-                        continue
-                    state["hackathon_details"][key] = user_response
-                    break
-                elif key == "isDrillPaid":
-                    if user_response.lower() not in ["yes", "no"]:
-                        print("Please respond with 'Yes' or 'No'.")
-                        continue
-                    state["hackathon_details"][key] = True if user_response.lower() == "yes" else False
-                    break
-                elif key == "drillType":
-                    corrected_input = auto_correct_input(key, user_response, self.llm)
-                    if corrected_input.lower() in ["theme based", "product based"]:
-                        state["hackathon_details"][key] = corrected_input.title()
-                    else:
-                        state["hackathon_details"][key] = "Theme Based"
-                    break
-                elif key == "drillPurpose":
-                    inferred_purpose = infer_purpose(state, user_response, self.llm)
-                    state["hackathon_details"][key] = inferred_purpose
-                    break
-                else:
-                    state["hackathon_details"][key] = user_response
+                if accepted:
                     break
         
         state["current_step"] = "generate_description"
         return state
 
+    def _handle_answer(self, state: dict, key: str, user_response: str) -> bool:
+        """Process the answer to a single question. Returns True if the answer was accepted."""
+        # Check if the user wants to cancel
+        if check_for_cancellation(user_response, self.llm):
+            print("AI Chatbot: Registration process has been canceled.")
+            state["current_step"] = "cancel"
+            self.speculative.invalidate()
+            return False
+        
+        # Handle specific fields
+        if key == "drillSubCategory":
+            inferred_subcategory = infer_subcategory(
+                user_response=user_response,
+                llm=self.llm,
+                category_subcategory_map=self.CATEGORY_SUBCATEGORY_MAP
+            )
+            if not inferred_subcategory:
+                print("Could not determine a valid subcategory. Please try again.")
+                return False
+            state["hackathon_details"]["drillSubCategory"] = inferred_subcategory
+            state["hackathon_details"]["drillCategory"] = self.CATEGORY_SUBCATEGORY_MAP[inferred_subcategory]
+        elif key == "drillRegistrationStartDt":
+            if not validate_date(user_response):
+                print("Invalid date format. Please use DD-MM-YYYY.")
+                return False
+            state["hackathon_details"][key] = user_response
+        elif key == "isDrillPaid":
+            if user_response.lower() not in ["yes", "no"]:
+                print("Please respond with 'Yes' or 'No'.")
+                return False
+            state["hackathon_details"][key] = True if user_response.lower() == "yes" else False
+        elif key == "drillType":
+            corrected_input = auto_correct_input(key, user_response, self.llm)
+            if corrected_input.lower() in ["theme based", "product based"]:
+                state["hackathon_details"][key] = corrected_input.title()
+            else:
+                state["hackathon_details"][key] = "Theme Based"
+        elif key == "drillPurpose":
+            inferred_purpose = infer_purpose(state, user_response, self.llm)
+            state["hackathon_details"][key] = inferred_purpose
+        else:
+            state["hackathon_details"][key] = user_response
+        # Start generating the description in the background once its inputs are known
+        self.speculative.update(state["hackathon_details"])
+        return True
+
     def _handle_cancellation(self, state: dict) -> dict:
         """Handle cancellation and ask if the user wants to register another event."""
         user_response = input("AI Chatbot: Would you like to register another hackathon/event? (Yes/No)\nYou: ").strip()
@@ -104,6 +123,18 @@ class HackathonChatbot:
         """
         Generate the drill description, send the data to the API, and handle the response.
         """
+        if self.recorder:
+            self.recorder.start_submit()
+        try:
+            state = self._register_drill(state)
+        finally:
+            # Record failed final steps too; they are usually the slow ones
+            if self.recorder:
+                self.recorder.end_submit(state["current_step"] == "end")
+        return state
+
+    def _register_drill(self, state: dict) -> dict:
+        """Build the payload and post it to the drills API."""
         drill_info = state["hackathon_details"]
         # Prepare the payload for the API
         registration_start_date = datetime.strptime(drill_info["drillRegistrationStartDt"], "%d-%m-%Y")
@@ -111,7 +142,7 @@ class HackathonChatbot:
         phase_start_date = registration_end_date + timedelta(days=1)
         phase_end_date = phase_start_date + timedelta(days=15)
         cost_info = "Free" if not drill_info["isDrillPaid"] else "Paid"
-        drill_info["drillDescription"] = generate_drill_description(drill_info, self.llm) + f" This event is {cost_info}."
+        drill_info["drillDescription"] = self.speculative.get_description(drill_info) + f" This event is {cost_info}."
         payload = {
             "drillName": drill_info["drillName"],
             "drillTimezone": drill_info["drillTimezone"],
@@ -148,9 +179,8 @@ class HackathonChatbot:
             "drillPartnerName": "WUElev8 Innovation services private ltd"
         }
         # Send the payload to the API endpoint
-        api_url = "https://api-dev.whereuelevate.com/internity/api/v1/drills"  # Replace with the actual API URL
         try:
-            response = requests.post(api_url, json=payload)
+            response = self.speculative.post(payload)
             response.raise_for_status()  # Raise an error for bad responses (4xx or 5xx)
             api_response = response.json()
             # Extract the custom URL from the API response
@@ -200,12 +230,21 @@ class HackathonChatbot:
         """
         Run the LangGraph workflow.
         """
+        new_session = True
         while True:
             try:
                 # Initialize the state for the current hackathon registration
                 initial_state = self._initialize_state()
+                if new_session:
+                    # Record the session when TRANSCRIPT_DIR is set; retries after an error reuse it
+                    self._start_recording()
+                    # Warm the Gemini and drills-API connections while the user answers
+                    self.speculative.invalidate()
+                    self.speculative.prewarm()
+                    new_session = False
                 # Execute the workflow
                 final_state = self.graph.invoke(initial_state)
+                new_session = True
                 # If the workflow ends naturally (not canceled), ask to register another event
                 if final_state["current_step"] == "end":
                     user_response = input("AI Chatbot: Would you like to register another hackathon/event? (Yes/No)\nYou: ").strip()
@@ -215,11 +254,21 @@ class HackathonChatbot:
                     else:
                         print("Thank you for using the Hackathon Registration Chatbot! Have a great day!")
                         break  # Exit the loop
+            except (EOFError, KeyboardInterrupt):
+                # No more input to read, so retrying would only loop
+                print("\nThank you for using the Hackathon Registration Chatbot! Have a great day!")
+                break
             except Exception as e:
                 # Handle errors gracefully
                 print(f"An error occurred: {str(e)}. Please try again or contact support.")
                 continue
             
+    def _start_recording(self):
+        """Start a new transcript recording if TRANSCRIPT_DIR is set."""
+        self.recorder = TranscriptRecorder.from_env(source="cli")
+        self.llm = self.recorder.wrap_llm(self._base_llm) if self.recorder else self._base_llm
+        self.speculative.llm = self.recorder.wrap_background_llm(self._base_llm) if self.recorder else self._base_llm
+
     def _initialize_state(self):
         """Initialize the state for a new hackathon registration."""
         return {"hackathon_details": DEFAULT_DRILL_INFO.copy(), "current_step": "start"}
\ No newline at end of file
@@ -0,0 +1,328 @@
+"""
+Replay recorded session transcripts through the chatbot they were recorded with
+(StreamlitHackathonChatbot.handle_user_input or HackathonChatbot._handle_answer)
+and produce a latency report.
+
+Recorded mode answers every LLM call with the output recorded for that turn and
+needs no GOOGLE_API_KEY; live mode calls Gemini. With --submit, the final
+description and payload step is replayed as well, with the POST stubbed out.
+
+Usage:
+    python -m src.replay transcripts/*.jsonl.gz --speedup 10 --concurrency 4 \
+        --llm recorded --submit --label v1.2 --output report.json --baseline previous.json
+"""
+import argparse
+import contextlib
+import glob
+import json
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.constants import DEFAULT_DRILL_INFO
+from src.speculative import SpeculativeExecutor
+from src.transcript import load_transcript
+
+
+class ReplaySessionState(dict):
+    """Stand-in for st.session_state supporting both attribute and key access."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+
+_calls_lock = threading.Lock()
+
+
+class RecordedChatModel(BaseChatModel):
+    """
+    Chat model that answers with the LLM outputs recorded for the current turn.
+
+    Each call sleeps for the recorded duration divided by speedup (0 skips it). Calls
+    beyond the recorded outputs return an empty response after the mean recorded
+    duration; the caller compares `calls` with the recorded count to flag the turn.
+    """
+
+    outputs: List[str] = []
+    durations: List[float] = []
+    speedup: float = 1.0
+    calls: int = 0
+
+    def load(self, outputs: List[str], durations: List[float]):
+        """Replace the recorded outputs with those of the next turn."""
+        self.outputs = list(outputs)
+        # Transcripts recorded before durations were stored replay without delay
+        self.durations = list(durations) or [0.0] * len(outputs)
+        self.calls = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        with _calls_lock:
+            index = self.calls
+            self.calls += 1
+        if index < len(self.outputs):
+            text, duration = self.outputs[index], self.durations[index]
+        else:
+            text = ""
+            duration = sum(self.durations) / len(self.durations) if self.durations else 0.0
+        if self.speedup > 0:
+            time.sleep(duration / self.speedup)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    @property
+    def _llm_type(self) -> str:
+        return "recorded"
+
+
+class _StubResponse:
+    """Successful drills-API response returned instead of a real POST."""
+
+    def raise_for_status(self):
+        pass
+
+    def json(self) -> dict:
+        return {"drillCustUrl": "replay"}
+
+
+class ReplaySpeculativeExecutor(SpeculativeExecutor):
+    """SpeculativeExecutor that never touches the network."""
+
+    def _warm_llm(self):
+        pass
+
+    def _warm_api(self):
+        pass
+
+    def post(self, payload: dict) -> _StubResponse:
+        return _StubResponse()
+
+
+def _create_chatbot(transcript: dict, llm, description_llm):
+    """
+    Create the chatbot the transcript was recorded with.
+
+    Returns a function replaying one answer and a function running the final
+    description and payload step.
+    """
+    source = transcript["session"].get("source")
+    if source == "streamlit":
+        # Imported here so that app1's Streamlit dependency is only needed for Streamlit transcripts
+        from app1 import API_ENDPOINT, StreamlitHackathonChatbot
+
+        session_state = ReplaySessionState(
+            started=True,
+            current_question_index=0,
+            hackathon_details=DEFAULT_DRILL_INFO.copy(),
+            chat_history=[],
+            registration_complete=False,
+            transcript_recorder=None,
+        )
+        chatbot = StreamlitHackathonChatbot(llm=llm, session_state=session_state)
+        session_state.speculative = ReplaySpeculativeExecutor(description_llm or chatbot.llm, API_ENDPOINT)
+        handle_turn = lambda turn: chatbot.handle_user_input(turn["input"], (turn["question"], turn["key"]))
+        return handle_turn, chatbot.submit_hackathon
+
+    if source == "cli":
+        from src.chatbot import API_ENDPOINT, HackathonChatbot
+
+        chatbot = HackathonChatbot(os.getenv("GOOGLE_API_KEY"), llm=llm)
+        chatbot.speculative = ReplaySpeculativeExecutor(description_llm or chatbot.llm, API_ENDPOINT)
+        state = chatbot._initialize_state()
+        handle_turn = lambda turn: chatbot._handle_answer(state, turn["key"], turn["input"])
+        submit = lambda: chatbot._generate_description(state)["current_step"] == "end"
+        return handle_turn, submit
+
+    raise ValueError(f"{transcript['path']}: unsupported transcript source {source!r}.")
+
+
+def replay_session(transcript: dict, speedup: float, llm_mode: str, replay_submit: bool) -> dict:
+    """Re-drive one recorded session and return the measured latency of every turn and the final step."""
+    recorded_llm = description_llm = None
+    if llm_mode == "recorded":
+        recorded_llm = RecordedChatModel(speedup=speedup)
+        description_llm = RecordedChatModel(speedup=speedup)
+        if transcript["submit"]:
+            description_llm.load(transcript["submit"]["llm_outputs"], transcript["submit"].get("llm_durations", []))
+    handle_turn, submit = _create_chatbot(transcript, recorded_llm, description_llm)
+
+    results = []
+    for turn in transcript["turns"]:
+        # speedup of 0 skips the recorded think time entirely
+        if speedup > 0:
+            time.sleep(turn["think_time"] / speedup)
+        if recorded_llm is not None:
+            recorded_llm.load(turn["llm_outputs"], turn.get("llm_durations", []))
+        start = time.perf_counter()
+        accepted = handle_turn(turn)
+        latency = time.perf_counter() - start
+        mismatched = accepted != turn["accepted"]
+        if recorded_llm is not None:
+            mismatched = mismatched or recorded_llm.calls != len(turn["llm_outputs"])
+        results.append({
+            "key": turn["key"],
+            "latency": latency,
+            "recorded_latency": turn["latency"],
+            "mismatched": mismatched,
+        })
+
+    submit_result = None
+    # Only sessions that reached the final step in the recording are replayed to the end
+    if replay_submit and transcript["submit"]:
+        start = time.perf_counter()
+        submitted = submit()
+        submit_result = {
+            "latency": time.perf_counter() - start,
+            "recorded_latency": transcript["submit"]["latency"],
+            "mismatched": submitted != transcript["submit"]["accepted"],
+        }
+    return {"turns": results, "submit": submit_result}
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Compute summary statistics for a list of latencies in seconds."""
+    if not latencies:
+        return {"count": 0}
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        index = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": percentile(50),
+        "p95": percentile(95),
+        "p99": percentile(99),
+        "max": ordered[-1],
+    }
+
+
+def build_report(results: List[dict], submits: List[dict], args, wall_time: float) -> dict:
+    """Aggregate replayed turn and final step results into a latency report."""
+    by_question = {}
+    for result in results:
+        by_question.setdefault(result["key"], []).append(result["latency"])
+    return {
+        "label": args.label,
+        "generated_at": datetime.now().isoformat(),
+        "llm_mode": args.llm,
+        "speedup": args.speedup,
+        "concurrency": args.concurrency,
+        "sessions": args.session_count,
+        "wall_time": wall_time,
+        "mismatched_turns": sum(1 for r in results if r["mismatched"]),
+        "latency": summarize([r["latency"] for r in results]),
+        "recorded_latency": summarize([r["recorded_latency"] for r in results]),
+        "by_question": {key: summarize(values) for key, values in by_question.items()},
+        "mismatched_submits": sum(1 for r in submits if r["mismatched"]),
+        "submit": summarize([r["latency"] for r in submits]),
+        "recorded_submit": summarize([r["recorded_latency"] for r in submits]),
+    }
+
+
+# Report fields that must match the baseline for latencies to be comparable
+COMPARABLE_FIELDS = ("llm_mode", "speedup", "concurrency")
+
+
+def compare_reports(report: dict, baseline: dict, threshold: float, min_delta: float) -> List[str]:
+    """
+    Return a description of every p50/p95 latency that regressed beyond threshold percent
+    and by at least min_delta seconds.
+    """
+    sections = [("overall", report["latency"], baseline.get("latency", {}))]
+    for key, stats in report["by_question"].items():
+        sections.append((key, stats, baseline.get("by_question", {}).get(key, {})))
+    sections.append(("submit", report["submit"], baseline.get("submit", {})))
+
+    regressions = []
+    for name, current, previous in sections:
+        for metric in ("p50", "p95"):
+            if not previous.get(metric) or metric not in current:
+                continue
+            delta = current[metric] - previous[metric]
+            change = delta / previous[metric] * 100
+            line = f"{name} {metric}: {previous[metric]:.4f}s -> {current[metric]:.4f}s ({change:+.1f}%)"
+            print(line, file=sys.stderr)
+            if change > threshold and delta >= min_delta:
+                regressions.append(line)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded chatbot sessions and report latency.")
+    parser.add_argument("transcripts", nargs="+", help="Transcript files or glob patterns (*.jsonl.gz)")
+    parser.add_argument("--speedup", type=float, default=1.0, help="Divide recorded think time and LLM time by this factor (0 skips both)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of sessions replayed in parallel")
+    parser.add_argument("--llm", choices=["recorded", "live"], default="recorded", help="Use recorded LLM outputs or call Gemini")
+    parser.add_argument("--label", default="", help="Version label stored in the report")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Previous report to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed latency regression in percent")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="Ignore regressions smaller than this many seconds")
+    parser.add_argument("--submit", action="store_true", help="Also replay the final description and payload step (POST stubbed out)")
+    args = parser.parse_args(argv)
+
+    paths = sorted({path for pattern in args.transcripts for path in glob.glob(pattern)})
+    if not paths:
+        parser.error("No transcript files found.")
+    transcripts = [load_transcript(path) for path in paths]
+    for transcript in transcripts:
+        if transcript["session"].get("source") not in ("streamlit", "cli"):
+            parser.error(f"{transcript['path']}: unsupported transcript source {transcript['session'].get('source')!r}.")
+    args.session_count = len(transcripts)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        current = {"llm_mode": args.llm, "speedup": args.speedup, "concurrency": args.concurrency}
+        differences = [
+            f"{field}={baseline.get(field)!r} (baseline) vs {current[field]!r}"
+            for field in COMPARABLE_FIELDS
+            if baseline.get(field) != current[field]
+        ]
+        if differences:
+            parser.error("Baseline was produced with different settings: " + ", ".join(differences))
+
+    start = time.perf_counter()
+    # Keep the chatbot's own messages out of the JSON report on stdout
+    with contextlib.redirect_stdout(sys.stderr), ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        sessions = list(executor.map(
+            lambda t: replay_session(t, args.speedup, args.llm, args.submit), transcripts
+        ))
+    results = [result for session in sessions for result in session["turns"]]
+    submits = [session["submit"] for session in sessions if session["submit"]]
+    report = build_report(results, submits, args, time.perf_counter() - start)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare_reports(report, baseline, args.threshold, args.min_delta)
+        if regressions:
+            print(f"Latency regressed by more than {args.threshold}%:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from src.utils import generate_drill_description
+
+# Fields generate_drill_description depends on besides drillPurpose
+DESCRIPTION_FIELDS = ("drillName", "drillType")
+# infer_purpose only ever returns one of these
+DRILL_PURPOSES = ("Innovation", "Hiring")
+
+
+class SpeculativeExecutor:
+    """
+    Use the user's think time to prepare the final registration step.
+
+    prewarm() opens the Gemini and drills-API connections in the background.
+    Once drillName and drillType are known, update() generates a description for
+    every possible purpose, so the work overlaps with the remaining questions and
+    get_description() only has to pick the one matching drillPurpose. It also warms
+    the drills-API connection again, since the one opened at session start has
+    usually been closed by the server before the final POST. If the name or type
+    changes, the speculative results are discarded.
+    """
+
+    def __init__(self, llm, api_url: str):
+        self.llm = llm
+        self.api_url = api_url
+        self.session = requests.Session()
+        self._executor = ThreadPoolExecutor(max_workers=len(DRILL_PURPOSES))
+        # Separate workers so a slow warm-up never delays the description futures
+        self._warm_executor = ThreadPoolExecutor(max_workers=2)
+        self._description_key: Optional[Tuple[str, ...]] = None
+        self._description_futures: Dict[str, Future] = {}
+
+    def prewarm(self):
+        """Warm the Gemini client and the drills-API connection without blocking."""
+        self._warm_executor.submit(self._warm_llm)
+        self._warm_executor.submit(self._warm_api)
+
+    def _warm_llm(self):
+        try:
+            self.llm.get_num_tokens("warmup")
+        except Exception:
+            # Warming is best effort; the real call will surface any errors
+            pass
+
+    def _warm_api(self):
+        try:
+            self.session.head(self.api_url, timeout=10)
+        except requests.exceptions.RequestException:
+            pass
+
+    def update(self, drill_info: dict):
+        """Start or invalidate the speculative description after an answer is stored."""
+        key = self._get_description_key(drill_info)
+        if key == self._description_key:
+            return
+        self.invalidate()
+        if all(key):
+            self._description_key = key
+            for purpose in DRILL_PURPOSES:
+                self._description_futures[purpose] = self._executor.submit(
+                    generate_drill_description, {**drill_info, "drillPurpose": purpose}, self.llm
+                )
+            # The POST is only a few answers away now, so refresh the idle connection
+            self._warm_executor.submit(self._warm_api)
+
+    def invalidate(self):
+        """Discard any speculative descriptions."""
+        for future in self._description_futures.values():
+            future.cancel()
+        self._description_key = None
+        self._description_futures = {}
+
+    def get_description(self, drill_info: dict) -> str:
+        """Return the drill description, reusing the speculative result when it is still valid."""
+        future = self._description_futures.get(drill_info.get("drillPurpose"))
+        if future is not None and self._get_description_key(drill_info) == self._description_key:
+            try:
+                return future.result()
+            except Exception:
+                # Fall back to generating the description synchronously
+                pass
+        self.invalidate()
+        return generate_drill_description(drill_info, self.llm)
+
+    def post(self, payload: dict) -> requests.Response:
+        """Send the payload to the drills API over the prewarmed connection."""
+        return self.session.post(self.api_url, json=payload)
+
+    @staticmethod
+    def _get_description_key(drill_info: dict) -> Tuple[str, ...]:
+        return tuple(drill_info.get(field, "") for field in DESCRIPTION_FIELDS)
@@ -0,0 +1,171 @@
+import gzip
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+class LLMOutputCollector(BaseCallbackHandler):
+    """Collect the raw text and duration of every LLM response produced during a turn."""
+
+    def __init__(self):
+        self.outputs: List[str] = []
+        self.durations: List[float] = []
+        self._started = {}
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        started = self._started.pop(run_id, None)
+        duration = time.perf_counter() - started if started is not None else 0.0
+        for generations in response.generations:
+            for generation in generations:
+                self.outputs.append(generation.text)
+                self.durations.append(round(duration, 6))
+
+    def drain(self) -> Tuple[List[str], List[float]]:
+        outputs, self.outputs = self.outputs, []
+        durations, self.durations = self.durations, []
+        return outputs, durations
+
+
+class TranscriptRecorder:
+    """
+    Record a registration session as gzip-compressed JSONL.
+
+    Every line is one event: a "session" header, "message" entries for the chat
+    history and "turn" entries holding the user's answer, the think time before
+    it, the processing latency and the LLM outputs (with their durations)
+    produced while handling it. A final "submit" entry holds the latency from the
+    last answer to the drill link and the background LLM calls (the speculative
+    drill descriptions) made during the session.
+    Each event is appended as its own gzip member, so the file stays readable even
+    if the process stops mid-session.
+    """
+
+    def __init__(self, directory: str, source: str):
+        os.makedirs(directory, exist_ok=True)
+        self.session_id = uuid.uuid4().hex
+        started_at = datetime.now()
+        self.path = os.path.join(
+            directory, f"{started_at.strftime('%Y%m%d-%H%M%S')}-{self.session_id}.jsonl.gz"
+        )
+        self.collector = LLMOutputCollector()
+        self.background_collector = LLMOutputCollector()
+        self._session_start = time.perf_counter()
+        self._last_turn_end = self._session_start
+        self._turn = None
+        self._submit_start = None
+        self._write({
+            "type": "session",
+            "session_id": self.session_id,
+            "source": source,
+            "started_at": started_at.isoformat(),
+        })
+
+    @classmethod
+    def from_env(cls, source: str) -> Optional["TranscriptRecorder"]:
+        """Create a recorder when TRANSCRIPT_DIR is set, otherwise return None."""
+        directory = os.getenv("TRANSCRIPT_DIR")
+        if not directory:
+            return None
+        return cls(directory, source)
+
+    def wrap_llm(self, llm):
+        """Return the LLM bound to this recorder's output collector."""
+        return llm.with_config(callbacks=[self.collector])
+
+    def wrap_background_llm(self, llm):
+        """Return the LLM bound to the collector for calls made outside of turns."""
+        return llm.with_config(callbacks=[self.background_collector])
+
+    def record_message(self, role: str, content: str):
+        """Record a chat history message."""
+        self._write({
+            "type": "message",
+            "role": role,
+            "content": content,
+            "t": round(time.perf_counter() - self._session_start, 6),
+        })
+
+    def start_turn(self, question: str, key: str, user_input: str):
+        """Mark the start of processing for a user's answer."""
+        now = time.perf_counter()
+        # Outputs produced outside of a turn are not replayed with it, so keep them
+        # out of the next turn.
+        self.collector.drain()
+        self._turn = {
+            "question": question,
+            "key": key,
+            "input": user_input,
+            "think_time": round(now - self._last_turn_end, 6),
+            "_start": now,
+        }
+
+    def end_turn(self, accepted: bool):
+        """Record the finished turn with its latency and LLM outputs."""
+        if self._turn is None:
+            return
+        now = time.perf_counter()
+        turn, self._turn = self._turn, None
+        start = turn.pop("_start")
+        llm_outputs, llm_durations = self.collector.drain()
+        turn.update({
+            "type": "turn",
+            "accepted": accepted,
+            "latency": round(now - start, 6),
+            "llm_outputs": llm_outputs,
+            "llm_durations": llm_durations,
+        })
+        self._last_turn_end = now
+        self._write(turn)
+
+    def start_submit(self):
+        """Mark the start of the final description and submission step."""
+        self._submit_start = time.perf_counter()
+
+    def end_submit(self, success: bool):
+        """Record the final step with its latency and the background LLM outputs."""
+        if self._submit_start is None:
+            return
+        latency = time.perf_counter() - self._submit_start
+        self._submit_start = None
+        llm_outputs, llm_durations = self.background_collector.drain()
+        self._write({
+            "type": "submit",
+            "accepted": success,
+            "latency": round(latency, 6),
+            "llm_outputs": llm_outputs,
+            "llm_durations": llm_durations,
+        })
+
+    def _write(self, event: dict):
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+
+
+def load_transcript(path: str) -> dict:
+    """Load a recorded transcript into its session header, list of turns and final submit step."""
+    session = {}
+    turns = []
+    submit = None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event["type"] == "session":
+                session = event
+            elif event["type"] == "turn":
+                turns.append(event)
+            elif event["type"] == "submit":
+                submit = event
+    return {"path": path, "session": session, "turns": turns, "submit": submit}
@@ -18,8 +18,6 @@ def get_llm():
         google_api_key=google_api_key  
     )
 
-llm = get_llm()
-
 def validate_date(date_str: str) -> bool:
     """Validate date format (DD-MM-YYYY)."""
     pattern = r"^(0[1-9]|[12][0-9]|3[01])-(0[1-9]|1[0-2])-\d{4}$"